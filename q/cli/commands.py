@@ -13,17 +13,29 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
-import distro
-import pyperclip
-from flatten_dict import flatten
 from termcolor import colored
 
 from q import Client, Role, __version__, load_client_class
 
-from .models import MODEL_CONFIGS, Tier, lookup
+from .models import MODEL_CONFIGS, TIERS, Tier, lookup
 from .session import StateManager
 from .terminal import InputError, qprint
 
+# region Patterns
+
+
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+NEWLINES_PATTERN = re.compile(r"\n{2,}")
+RESPONSE_FENCE_PATTERN = re.compile(r"^```.*?\n(.*)\n```$", flags=re.DOTALL)
+CODE_BLOCK_PATTERN = re.compile(r"```(?:\w+\n?)?(.*?)```", flags=re.DOTALL)
+MARKDOWN_PATTERN = re.compile(
+    r"`(?P<inline_code>[^`]+)`"  # inline code
+    r"|\*\*(?P<bold>[^*]+)\*\*"  # bold text
+    r"|\*(?P<italic>[^*]+)\*",  # italic text
+    flags=re.DOTALL,
+)
+
+
 # region Registry
 
 
@@ -87,6 +99,9 @@ class LLMCommand(Command):
     system: str | None = None
     clip: bool = False
 
+    CODE_COLOR = "cyan"
+    EMPHASIS_COLOR = "magenta"
+
     async def execute(self) -> None:
         # resolve model override
         if ModelOption in self.opts:
@@ -122,8 +137,9 @@ class LLMCommand(Command):
         # process response
         self.process_response(response)
 
-        # save session
+        # save this session, then reap those of exited shells
         StateManager.save_session(self.char, client.messages)
+        StateManager.reap_sessions()
 
     async def build_prompt(self, file_text: str) -> str:
         """Build the user prompt string."""
@@ -141,6 +157,7 @@ class LLMCommand(Command):
 
             # copy output to clipboard
             if self.clip:
+                import pyperclip
                 with contextlib.suppress(pyperclip.PyperclipException):
                     pyperclip.copy(formatted_response)
                     qprint("Copied to clipboard.", color="yellow", file=sys.stderr)
@@ -149,35 +166,44 @@ class LLMCommand(Command):
     def _format_text_response(text: str) -> str:
         """Normalize the formatting of an LLM text response."""
         # shorten links from web search responses
-        text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text).strip()
+        if "](" in text:
+            text = LINK_PATTERN.sub(r"\1", text)
+        text = text.strip()
 
         # convert two-plus newlines into only two
-        text = re.sub(r"\n{2,}", "\n\n", text)
+        if "\n\n" in text:
+            text = NEWLINES_PATTERN.sub("\n\n", text)
 
         # remove formatting from response-level code blocks
-        text = re.sub(r"^```.*?\n(.*)\n```$", r"\1", text, flags=re.DOTALL)
+        if text.startswith("```"):
+            text = RESPONSE_FENCE_PATTERN.sub(r"\1", text)
 
         return text
 
-    @staticmethod
-    def _print_text_response(text: str, code_color: str = "cyan", emphasis_color: str = "magenta") -> None:
+    @classmethod
+    def _print_text_response(cls, text: str) -> None:
         """Print an LLM text response to stdout, replacing formatting symbols with colors."""
         if sys.stdout.isatty():
-            # convert code blocks into colored text
-            text = re.sub(
-                r"```(?:\w+\n?)?(.*?)```", lambda m: colored(m.group(1).strip(), code_color), text, flags=re.DOTALL
+            # split out code blocks first so a stray backtick cannot pair with a fence, then replace the
+            # remaining formatting symbols in a single pass over the text between them
+            segments = CODE_BLOCK_PATTERN.split(text)
+            text = "".join(
+                colored(segment.strip(), cls.CODE_COLOR) if i % 2 else MARKDOWN_PATTERN.sub(cls._colorize_markdown, segment)
+                for i, segment in enumerate(segments)
             )
 
-            # convert inline-code into colored text
-            text = re.sub(r"`([^`]+)`", lambda m: colored(m.group(1), code_color), text)
-
-            # convert bold text into colored text
-            text = re.sub(r"\*\*([^*]+)\*\*", lambda m: colored(m.group(1), emphasis_color), text)
+        qprint(text)
 
-            # convert italic text into colored text
-            text = re.sub(r"\*([^*]+)\*", lambda m: colored(m.group(1), emphasis_color), text)
+    @classmethod
+    def _colorize_markdown(cls, m: re.Match) -> str:
+        """Replace a `MARKDOWN_PATTERN` match with its colored content."""
+        # convert inline-code into code-colored text
+        if m["inline_code"] is not None:
+            return colored(m["inline_code"], cls.CODE_COLOR)
 
-        qprint(text)
+        # convert bold and italic text into emphasis-colored text, coloring any code inside it first
+        emphasis = MARKDOWN_PATTERN.sub(cls._colorize_markdown, m["bold"] or m["italic"])
+        return colored(emphasis, cls.EMPHASIS_COLOR)
 
 
 # region Commands
@@ -244,6 +270,7 @@ class ShellCommand(LLMCommand):
         sys_name = platform.system()
         if sys_name == "Linux":
             with contextlib.suppress(ImportError):
+                import distro
                 sys_name = distro.name(pretty=True)
 
         if shell:
@@ -385,9 +412,13 @@ class ImageCommand(LLMCommand):
     client_name = "ImageClient"
     system = "Generate an image."
 
+    # default filename: drop punctuation, spaces to underscores, short enough for any filesystem
+    SLUG_TABLE = str.maketrans(" ", "_", string.punctuation)
+    SLUG_MAX_BYTES = 64  # UTF-8 bytes, not characters: filename limits are in bytes
+
     def process_response(self, response: bytes) -> None:
         """Save image to disk."""
-        text = self.value.translate(str.maketrans("", "", string.punctuation)).replace(" ", "_")
+        text = self.value.translate(self.SLUG_TABLE).encode()[:self.SLUG_MAX_BYTES].decode(errors="ignore")
         path = Path(self.opts.get(OutputOption) or f"q_{text}")
         if not path.suffix:
             path = path.with_suffix(f".{Client._sniff_mime(response).split('/')[-1]}")
@@ -449,28 +480,25 @@ class ModelOption(Flag):
     @classmethod
     def resolve(cls, value: str, client_name: str, tier: Tier) -> tuple[str, str, dict]:
         """Resolve a model flag value to (provider, model_name, model_args)."""
-        providers = set(MODEL_CONFIGS)
-        tiers = {t.value for t in Tier}
-
         # provider:tier/model
         if ":" in value:
             provider, suffix = value.split(":", 1)
-            if provider not in providers:
+            if provider not in MODEL_CONFIGS:
                 raise InputError(f"unknown provider: {provider}")
             # provider:tier (e.g. "openai:high")
-            if suffix in tiers:
-                return provider, *lookup(provider, client_name, Tier(suffix))
+            if suffix in TIERS:
+                return provider, *lookup(provider, client_name, TIERS[suffix])
             # provider:model (e.g. "openai:gpt-4.1-nano")
             return provider, suffix, {}
 
         # provider (e.g. "openai")
-        if value in providers:
+        if value in MODEL_CONFIGS:
             return value, *lookup(value, client_name, tier)
 
         # tier (e.g. "high")
-        if value in tiers:
+        if value in TIERS:
             provider = StateManager.default_provider()
-            return provider, *lookup(provider, client_name, Tier(value))
+            return provider, *lookup(provider, client_name, TIERS[value])
 
         raise InputError(f"cannot resolve model: {value}")
 
@@ -500,6 +528,7 @@ class VerboseOption(Flag):
         qprint("model:", color=cls.SECONDARY_COLOR, file=sys.stderr, end=" ")
         qprint(f"{provider}:{client.model}", file=sys.stderr)
         if client.model_args:
+            from flatten_dict import flatten
             for k, v in flatten(client.model_args, reducer="dot").items():
                 qprint(f"{k}:", color=cls.SECONDARY_COLOR, file=sys.stderr, end=" ")
                 qprint(f"{v}", file=sys.stderr)
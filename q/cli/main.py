@@ -2,14 +2,12 @@ import asyncio
 import sys
 
 from .parser import parse
-from .session import StateManager
 from .terminal import InputError, qprint
 
 
-def main():
+def main(argv: list[str] | None = None):
     try:
-        command = parse(sys.argv[1:])
-        StateManager.reap_sessions()
+        command = parse(sys.argv[1:] if argv is None else argv)
         asyncio.run(command.execute())
     except (InputError, ImportError) as e:
         qprint(str(e), color="red", file=sys.stderr)
@@ -8,6 +8,8 @@ class Tier(Enum):
     MED = "med"
     HIGH = "high"
 
+TIERS = {tier.value: tier for tier in Tier}
+
 MAX_TOKENS = 16384
 
 MODEL_CONFIGS = {
@@ -4,6 +4,8 @@ from typing import Any
 from .commands import FLAG_MAP, Command, Flag, HelpCommand, ValueType, get_default_command
 from .terminal import InputError
 
+FLAG_PATTERN = re.compile(r"^-[a-z]+$")
+
 
 def _resolve_pending(pending_flags: list[type[Flag]], pending_tokens: list[str]) -> dict[type[Flag], Any]:
     """
@@ -83,7 +85,7 @@ def parse(argv: list[str]) -> Command:
             continue
 
         # resolve at boundary (new flag or end)
-        is_flag = flag_parsing_enabled and token and bool(re.match(r"^-[a-z]+$", token))
+        is_flag = flag_parsing_enabled and token and bool(FLAG_PATTERN.match(token))
         if is_flag or at_end:
             resolved_bindings = _resolve_pending(pending_flags, pending_tokens)
 
@@ -1,4 +1,5 @@
 import contextlib
+import functools
 import os
 import sys
 from pathlib import Path
@@ -9,7 +10,7 @@ from pydantic import BaseModel, Field
 
 from q import Message
 
-from .terminal import qinput, qprint
+from .terminal import InputError, qinput, qprint
 
 RESOURCES_DIR = Path.home() / ".q"
 CONFIG_PATH = RESOURCES_DIR / "config.json"
@@ -24,10 +25,15 @@ class Config(BaseModel):
     code_lang: str = "python"
 
 
-class Session(BaseModel):
-    """Conversation session with message history."""
+class SessionHeader(BaseModel):
+    """Session fields needed to check ownership, parsed without the message history."""
 
     pid_start: float
+
+
+class Session(SessionHeader):
+    """Conversation session with message history."""
+
     command_char: str | None = None
     messages: list[Message] = Field(default_factory=list)
 
@@ -38,8 +44,9 @@ class StateManager:
     # region Sessions
 
     @classmethod
+    @functools.cache
     def load_session(cls) -> Session:
-        """Load current session from disk, or create a new one."""
+        """Load current session from disk once per process, or create a new one."""
         pid = os.getppid()
         pid_start = cls._pid_start(pid)
         session = cls._pid_session(pid)
@@ -65,7 +72,8 @@ class StateManager:
         pid = os.getppid()
         session = Session(pid_start=cls._pid_start(pid), command_char=command_char, messages=messages)
         SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
-        (SESSIONS_DIR / f"{pid}.json").write_text(session.model_dump_json(indent=2))
+        cls._write_atomic(SESSIONS_DIR / f"{pid}.json", session.model_dump_json(indent=2))
+        cls.load_session.cache_clear()
 
     @classmethod
     def reap_sessions(cls) -> None:
@@ -74,9 +82,10 @@ class StateManager:
             if not path.stem.isdigit():
                 continue
             pid = int(path.stem)
-            session = cls._pid_session(pid)
-            if not session or session.pid_start != cls._pid_start(pid):
-                path.unlink(missing_ok=True)
+            pid_start = cls._pid_start(pid)
+            if pid_start is None or cls._pid_session_start(pid) != pid_start:
+                with contextlib.suppress(OSError):  # housekeeping only; never fail the command over it
+                    path.unlink(missing_ok=True)
 
     @classmethod
     def _pid_session(cls, pid: int) -> Session | None:
@@ -85,6 +94,13 @@ class StateManager:
             return Session.model_validate_json((SESSIONS_DIR / f"{pid}.json").read_text())
         return None
 
+    @classmethod
+    def _pid_session_start(cls, pid: int) -> float | None:
+        """Get the process start time recorded in a session, or None if unreadable."""
+        with contextlib.suppress(Exception):
+            return SessionHeader.model_validate_json((SESSIONS_DIR / f"{pid}.json").read_text()).pid_start
+        return None
+
     @classmethod
     def _pid_start(cls, pid: int) -> float | None:
         """Get start time for a process, or None if no such process."""
@@ -92,14 +108,26 @@ class StateManager:
             return round(psutil.Process(pid).create_time(), 2)
         return None
 
+    @staticmethod
+    def _write_atomic(path: Path, text: str) -> None:
+        """Write a file via a temp file and rename, so readers never see a partial write."""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
     # region Config
 
     @classmethod
+    @functools.cache
     def load_config(cls) -> Config:
-        """Load config from disk, or create default if missing."""
+        """Load config from disk once per process, or create default if missing."""
         if not CONFIG_PATH.exists():
             RESOURCES_DIR.mkdir(parents=True, exist_ok=True)
-            CONFIG_PATH.write_text(Config().model_dump_json(indent=2))
+            cls._write_atomic(CONFIG_PATH, Config().model_dump_json(indent=2))
         try:
             return Config.model_validate_json(CONFIG_PATH.read_text())
         except Exception:
@@ -123,7 +151,12 @@ class StateManager:
         """Load API key from .env file. Prompts and saves if missing."""
         key = dotenv_values(ENV_PATH).get(provider.lower())
         if not key:
-            key = qinput(f"{provider} API key not found. Enter key: ", secret=True).strip()
+            try:
+                key = qinput(f"{provider} API key not found. Enter key: ", secret=True).strip()
+            except InputError:
+                raise InputError(f"{provider} API key not found; pass one with -k or run q in a terminal to save it") from None
+            if not key:
+                raise InputError(f"no {provider} API key entered")
             # TODO: add load_provider_module(provider).validate_key(key)
             cls.save_api_key(provider, key)
         return key
@@ -1,5 +1,6 @@
 import getpass
 import sys
+import warnings
 
 from colorama import just_fix_windows_console
 from termcolor import colored
@@ -21,9 +22,15 @@ def qprint(*values: str, color: str | None = None, **kwargs):
 
 
 def qinput(text: str = "", color: str | None = None, secret: bool = False) -> str:
-    """Prompt user for input. No echo if secret=True."""
+    """Prompt user for input. No echo if secret=True, which requires a terminal."""
     if color:
         text = colored(text, color)
     if secret:
-        return getpass.getpass(text)
+        # getpass warns before falling back to echoed stdin; refuse instead
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", getpass.GetPassWarning)
+            try:
+                return getpass.getpass(text)
+            except getpass.GetPassWarning:
+                raise InputError("no terminal to read secret input from") from None
     return input(text)
@@ -16,17 +16,28 @@ class AnthropicClient[T](Client[T]):
     @staticmethod
     def _create_async_client(api_key: str) -> Any:
         import anthropic
-        return anthropic.AsyncAnthropic(api_key=api_key)
+        return anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)  # retries are handled by Client._retry
 
-    @staticmethod
-    def _should_retry(error: Exception) -> bool:
+    @classmethod
+    def _should_retry(cls, error: Exception) -> bool:
         import anthropic
         if isinstance(error, anthropic.APIConnectionError):  # includes timeouts
             return True
         if isinstance(error, anthropic.APIStatusError):
-            return error.status_code == 429 or 500 <= error.status_code < 600
+            # the provider can override the status-based decision
+            should_retry = error.response.headers.get("x-should-retry")
+            if should_retry in ("true", "false"):
+                return should_retry == "true"
+            return error.status_code in cls.RETRY_STATUSES
         return False
 
+    @staticmethod
+    def _retry_after(error: Exception) -> float | None:
+        import anthropic
+        if isinstance(error, anthropic.APIStatusError):
+            return Client._parse_retry_after(error.response.headers)
+        return None
+
     @classmethod
     def _inject_args(cls, model_args: dict) -> dict:
         """Set the default max_tokens if missing."""
@@ -62,11 +73,13 @@ class TextClient(AnthropicClient[str]): ...
 
 
 class WebClient(AnthropicClient[str]):
+    TOOL: ClassVar[dict] = {"type": "web_search_20250305", "name": "web_search", "max_uses": 5}
+
     @classmethod
     def _inject_args(cls, model_args: dict) -> dict:
         """Add the web-search tool, merging with any existing tools."""
         model_args = super()._inject_args(model_args)
         tools = model_args.get("tools", [])
-        if not any(tool.get("name") == "web_search" for tool in tools):
-            tools = [*tools, {"type": "web_search_20250305", "name": "web_search", "max_uses": 5}]
+        if not any(tool.get("name") == cls.TOOL["name"] for tool in tools):
+            tools = [*tools, cls.TOOL]
         return {**model_args, "tools": tools}
@@ -1,8 +1,13 @@
 import asyncio
+import math
 import random
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from datetime import timezone
+from email.utils import parsedate_to_datetime
 from enum import Enum
+from functools import cached_property
 from typing import Any, ClassVar
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -29,10 +34,18 @@ class Client[T](ABC):
     # fix for providers that reject images in assistant turns
     SPOOF_ASSISTANT_IMAGES: ClassVar[bool] = False
 
+    # provider offers a deferred batch API (see `_batch_request`)
+    SUPPORTS_BATCH: ClassVar[bool] = False
+
     # retry configuration
+    RETRY_STATUSES: ClassVar[frozenset[int]] = frozenset({408, 409, 429, *range(500, 600)})
     MAX_RETRIES = 5
+    MAX_RETRY_TIME: float | None = None  # seconds after the first attempt; no retry may sleep past it
+    BASE_DELAY = 1.0
+    MAX_DELAY = 30.0
+    MAX_RETRY_AFTER = 60.0  # longest provider-requested wait to honor; longer ones fall back to backoff
     BACKOFF_FACTOR = 2.0
-    MAX_JITTER = 0.1
+    DECORRELATED_JITTER = False  # for many clients contending on one rate limit
 
     def __init__(self, api_key: str, model: str, messages: list[Message] | None = None, system: str | None = None, **model_args):
         self.api_key = api_key
@@ -40,34 +53,61 @@ class Client[T](ABC):
         self.model_args = model_args
         self.messages = messages.copy() if messages else []
         self.system = system
-        self._async_client = self._create_async_client(api_key)
+
+    @cached_property
+    def _async_client(self) -> Any:
+        """Create the provider SDK client on first use, so failures before the request skip the SDK import."""
+        return self._create_async_client(self.api_key)
 
     async def generate(self, prompt: str, system: str | None = None, images: list[bytes] | None = None) -> T:
         """Generate a response and update conversation state and system prompt if provided. Use `""` to clear the system prompt."""
         if system is not None:
             self.system = system or None
-        self.messages.append(Message(role=Role.USER, text=prompt, images=images or []))
-        output = await self._generate(self.messages, self.system)
+        # only record the exchange once the request succeeds, so a retried call does not repeat the prompt
+        message = Message(role=Role.USER, text=prompt, images=images or [])
+        output = await self._generate([*self.messages, message], self.system)
         if isinstance(output, str):
-            self.messages.append(Message(role=Role.ASSISTANT, text=output))
+            response = Message(role=Role.ASSISTANT, text=output)
         elif isinstance(output, bytes):
-            self.messages.append(Message(role=Role.ASSISTANT, text="", images=[output]))
+            response = Message(role=Role.ASSISTANT, text="", images=[output])
         elif isinstance(output, list) and all(isinstance(item, bytes) for item in output):
-            self.messages.append(Message(role=Role.ASSISTANT, text="", images=output))
+            response = Message(role=Role.ASSISTANT, text="", images=output)
         else:
             raise TypeError(f"unexpected output type: {type(output).__name__}")
+        self.messages.extend([message, response])
         return output
 
-    async def batch_generate(self, prompt_list: list[str], system: str | None = None, images: list[bytes] | None = None, n_threads: int = 8) -> list[T]:
-        """Concurrently generate a response to each input with the current history; *does not update state*."""
+    async def batch_generate(self, prompt_list: list[str], system: str | None = None, images: list[bytes] | None = None, n_threads: int = 8, deferred: bool = False) -> list[T]:
+        """Concurrently generate a response to each input with the current history; *does not update state*. Use `deferred=True` to submit a single job to the provider's batch API instead, trading latency (up to 24h) for lower cost."""
         system = system if system is not None else self.system
+
+        # format the shared history once; only the new user message differs per prompt
+        formatted_history = self._format_messages(self.messages)
+
+        def format_request(prompt: str) -> list[dict]:
+            return [*formatted_history, self._format_message(Message(role=Role.USER, text=prompt, images=images or []))]
+
+        if deferred:
+            if not self.SUPPORTS_BATCH:
+                raise NotImplementedError(f"{type(self).__name__} does not support deferred batches")
+            formatted_requests = [format_request(prompt) for prompt in prompt_list]
+            responses = await self._batch_request(formatted_requests, system, self._inject_args(self.model_args))
+            return [self._extract_output(response) for response in responses]
+
         semaphore = asyncio.Semaphore(n_threads)
 
         async def process(prompt: str) -> T:
             async with semaphore:
-                return await self._generate([*self.messages, Message(role=Role.USER, text=prompt, images=images or [])], system)
+                return await self._send(format_request(prompt), system)
 
-        return await asyncio.gather(*(process(prompt) for prompt in prompt_list))
+        # fail fast: once one prompt fails for good, stop the rest from retrying against the provider
+        tasks = [asyncio.ensure_future(process(prompt)) for prompt in prompt_list]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
 
     def drop_exchanges(self, n: int = 1) -> None:
         """Drop the last `n` exchanges (a user message and the responses after it)."""
@@ -78,17 +118,25 @@ class Client[T](ABC):
             if self.messages[i].role == Role.USER:
                 count += 1
                 if count == n:
-                    self.messages = self.messages[:i]
+                    del self.messages[i:]
                     break
 
     async def _generate(self, messages: list[Message], system: str | None) -> T:
         """Format messages, inject model args, send the request with retries, and extract the output."""
-        if self.SPOOF_ASSISTANT_IMAGES:
-            messages = self._spoof_assistant_images(messages)
-        formatted_messages = [self._format_message(message) for message in messages]
+        return await self._send(self._format_messages(messages), system)
+
+    async def _send(self, formatted_messages: list[dict], system: str | None) -> T:
+        """Inject model args, send already-formatted messages with retries, and extract the output."""
         response = await self._retry(self._request, formatted_messages, system, self._inject_args(self.model_args))
         return self._extract_output(response)
 
+    @classmethod
+    def _format_messages(cls, messages: list[Message]) -> list[dict]:
+        """Spoof assistant images if needed and format messages into the provider's API format."""
+        if cls.SPOOF_ASSISTANT_IMAGES:
+            messages = cls._spoof_assistant_images(messages)
+        return [cls._format_message(message) for message in messages]
+
     @staticmethod
     def _spoof_assistant_images(messages: list[Message]) -> list[Message]:
         """Spoof assistant images as user images for providers that reject images in assistant turns."""
@@ -102,21 +150,63 @@ class Client[T](ABC):
                 result.append(message)
         return result
 
-    async def _retry(self, func: Callable[..., Awaitable[T]], *args: Any) -> T:
-        """Call an async func with exponential backoff on transient errors."""
+    async def _retry(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Call an async func with exponential backoff on transient errors, within the retry count and time budget."""
+        deadline = time.monotonic() + self.MAX_RETRY_TIME if self.MAX_RETRY_TIME is not None else None
+        schedule = self._backoff_schedule()
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                return await func(*args)
+                return await func(*args, **kwargs)
             except Exception as e:
                 if attempt == self.MAX_RETRIES or not self._should_retry(e):
                     raise
-                await asyncio.sleep(self._calc_backoff(attempt))
+                # honor a provider's requested wait up to `MAX_RETRY_AFTER` in full (retrying sooner just fails again),
+                # jittered so clients limited together do not retry in lockstep; the `MAX_RETRY_TIME` check below still applies
+                retry_after = self._retry_after(e)
+                if retry_after is not None and retry_after <= self.MAX_RETRY_AFTER:
+                    delay = retry_after + random.random() * self.BASE_DELAY
+                else:
+                    delay = next(schedule)
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    raise
+                await asyncio.sleep(delay)
+
+    def _backoff_schedule(self) -> Iterator[float]:
+        """Yield the backoff delay for each retry, with full jitter or decorrelated from the previous delay, capped at `MAX_DELAY`."""
+        delay = self.BASE_DELAY
+        ceiling = self.BASE_DELAY
+        for _ in range(self.MAX_RETRIES):
+            if self.DECORRELATED_JITTER:
+                delay = min(self.MAX_DELAY, random.uniform(self.BASE_DELAY, delay * 3))
+            else:
+                delay = random.random() * min(self.MAX_DELAY, ceiling)
+                ceiling *= self.BACKOFF_FACTOR
+            yield delay
 
-    def _calc_backoff(self, attempt: int) -> float:
-        """Calculate the exponential backoff delay with jitter for a retry attempt."""
-        base_delay = self.BACKOFF_FACTOR**attempt
-        jitter = random.uniform(0, self.MAX_JITTER * base_delay)
-        return base_delay + jitter
+    @staticmethod
+    def _retry_after(error: Exception) -> float | None:
+        """Seconds the provider asked to wait before retrying the failed request, if it said."""
+        return None
+
+    @staticmethod
+    def _parse_retry_after(headers: Mapping[str, str]) -> float | None:
+        """Parse `retry-after-ms` or `retry-after` (seconds or an HTTP date) from response headers."""
+        try:
+            if (value := headers.get("retry-after-ms")) is not None:
+                seconds = float(value) / 1000
+            elif (value := headers.get("retry-after")) is not None:
+                try:
+                    seconds = float(value)
+                except ValueError:
+                    date = parsedate_to_datetime(value)
+                    if date.tzinfo is None:  # a -0000 zone parses as naive but means UTC
+                        date = date.replace(tzinfo=timezone.utc)
+                    seconds = date.timestamp() - time.time()
+            else:
+                return None
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, seconds) if math.isfinite(seconds) else None
 
     @staticmethod
     def _sniff_mime(data: bytes) -> str:
@@ -136,14 +226,18 @@ class Client[T](ABC):
         """Adjust the model args before a request; never mutates input."""
         return model_args
 
+    async def _batch_request(self, formatted_requests: list[list[dict]], system: str | None, model_args: dict) -> list[Any]:
+        """Submit formatted requests as one batch job and return the raw responses in input order. Required if `SUPPORTS_BATCH`."""
+        raise NotImplementedError
+
     @staticmethod
     @abstractmethod
     def _create_async_client(api_key: str) -> Any:
         """Import the provider SDK and create its async client instance."""
 
-    @staticmethod
+    @classmethod
     @abstractmethod
-    def _should_retry(error: Exception) -> bool:
+    def _should_retry(cls, error: Exception) -> bool:
         """Determine whether an error should trigger a retry."""
 
     @classmethod
@@ -10,18 +10,18 @@ class GeminiClient[T](Client[T]):
     """Base client for the Gemini Interactions API."""
 
     ROLES: ClassVar[dict[Role, str]] = {Role.USER: "user_input", Role.ASSISTANT: "model_output"}
+    RETRY_STATUSES = Client.RETRY_STATUSES - {409}  # a Gemini 409 is a real conflict, not a transient lock
 
     @staticmethod
     def _create_async_client(api_key: str) -> Any:
         from google import genai
         return genai.Client(api_key=api_key).aio
 
-    @staticmethod
-    def _should_retry(error: Exception) -> bool:
+    @classmethod
+    def _should_retry(cls, error: Exception) -> bool:
         from google import genai
         if isinstance(error, genai.errors.APIError):
-            code = error.code
-            return isinstance(code, int) and (code == 429 or 500 <= code < 600)
+            return error.code in cls.RETRY_STATUSES
         return False
 
     @classmethod
@@ -54,21 +54,23 @@ class TextClient(GeminiClient[str]): ...
 
 
 class WebClient(GeminiClient[str]):
+    TOOL: ClassVar[dict] = {"type": "google_search"}
+
     @classmethod
     def _inject_args(cls, model_args: dict) -> dict:
         """Add the web-search tool, merging with any existing tools."""
         model_args = super()._inject_args(model_args)
         tools = model_args.get("tools", [])
-        if not any(tool.get("type") == "google_search" for tool in tools):
-            tools = [*tools, {"type": "google_search"}]
+        if not any(tool.get("type") == cls.TOOL["type"] for tool in tools):
+            tools = [*tools, cls.TOOL]
         return {**model_args, "tools": tools}
 
 
 class ImageClient(GeminiClient[bytes]):
-    @staticmethod
-    def _should_retry(error: Exception) -> bool:
+    @classmethod
+    def _should_retry(cls, error: Exception) -> bool:
         from google import genai
-        if GeminiClient._should_retry(error):
+        if super()._should_retry(error):
             return True
         # transient image-generation failures surface as a 400; retry only those
         return (isinstance(error, genai.errors.APIError) and error.code == 400
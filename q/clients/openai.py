@@ -1,4 +1,8 @@
+import asyncio
 import base64
+import contextlib
+import json
+import uuid
 from typing import Any, ClassVar
 
 from .base import Client, Message, Role
@@ -11,21 +15,36 @@ class OpenAIClient[T](Client[T]):
 
     ROLES: ClassVar[dict[Role, str]] = {Role.USER: "user", Role.ASSISTANT: "assistant"}
     SPOOF_ASSISTANT_IMAGES = True
+    SUPPORTS_BATCH = True
+
+    # seconds between Batch API status checks
+    BATCH_POLL_INTERVAL = 30.0
 
     @staticmethod
     def _create_async_client(api_key: str) -> Any:
         import openai
-        return openai.AsyncOpenAI(api_key=api_key)
+        return openai.AsyncOpenAI(api_key=api_key, max_retries=0)  # retries are handled by Client._retry
 
-    @staticmethod
-    def _should_retry(error: Exception) -> bool:
+    @classmethod
+    def _should_retry(cls, error: Exception) -> bool:
         import openai
         if isinstance(error, openai.APIConnectionError):  # includes timeouts
             return True
         if isinstance(error, openai.APIStatusError):
-            return error.status_code == 429 or 500 <= error.status_code < 600
+            # the provider can override the status-based decision
+            should_retry = error.response.headers.get("x-should-retry")
+            if should_retry in ("true", "false"):
+                return should_retry == "true"
+            return error.status_code in cls.RETRY_STATUSES
         return False
 
+    @staticmethod
+    def _retry_after(error: Exception) -> float | None:
+        import openai
+        if isinstance(error, openai.APIStatusError):
+            return Client._parse_retry_after(error.response.headers)
+        return None
+
     @classmethod
     def _format_message(cls, message: Message) -> dict:
         """Format a single message into Responses API format."""
@@ -36,12 +55,78 @@ class OpenAIClient[T](Client[T]):
             content.append({"type": "input_image", "detail": "auto", "image_url": data_url})
         return {"role": cls.ROLES[message.role], "content": content}
 
+    def _request_body(self, formatted_messages: list[dict], system: str | None, model_args: dict) -> dict:
+        """Build a Responses API request body."""
+        body = {"model": self.model, "input": formatted_messages, **model_args}
+        if system:
+            body["input"] = [{"role": "system", "content": system}, *formatted_messages]
+        return body
+
     async def _request(self, formatted_messages: list[dict], system: str | None, model_args: dict) -> Any:
         """Send a request to the Responses API."""
-        kwargs = {"model": self.model, "input": formatted_messages, **model_args}
-        if system:
-            kwargs["input"] = [{"role": "system", "content": system}, *formatted_messages]
-        return await self._async_client.responses.create(**kwargs)
+        return await self._async_client.responses.create(**self._request_body(formatted_messages, system, model_args))
+
+    async def _batch_request(self, formatted_requests: list[list[dict]], system: str | None, model_args: dict) -> list[Any]:
+        """Run Responses API requests as one Batch API job, polling until it finishes."""
+        from openai.types.responses import Response
+
+        lines = [
+            json.dumps({"custom_id": str(i), "method": "POST", "url": "/v1/responses", "body": self._request_body(formatted_messages, system, model_args)})
+            for i, formatted_messages in enumerate(formatted_requests)
+        ]
+        # reuse one idempotency key across retries, so a create that timed out after succeeding is not duplicated
+        idempotency_key = f"q-batch-{uuid.uuid4()}"
+        input_file = await self._retry(
+            self._async_client.files.create, file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch",
+            extra_headers={"Idempotency-Key": f"{idempotency_key}-file"},
+        )
+        batch = None
+        try:
+            batch = await self._retry(
+                self._async_client.batches.create, input_file_id=input_file.id, endpoint="/v1/responses", completion_window="24h",
+                extra_headers={"Idempotency-Key": f"{idempotency_key}-batch"},
+            )
+            try:
+                while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                    await asyncio.sleep(self.BATCH_POLL_INTERVAL)
+                    batch = await self._retry(self._async_client.batches.retrieve, batch.id)
+            except asyncio.CancelledError:
+                # stop the job too, rather than leave it running (and billed) with no one waiting
+                with contextlib.suppress(Exception):
+                    await self._async_client.batches.cancel(batch.id)
+                raise
+
+            # the output file holds successful requests only, in any order
+            bodies = {}
+            if batch.output_file_id:
+                output = await self._retry(self._async_client.files.content, batch.output_file_id)
+                for line in output.text.splitlines():
+                    result = json.loads(line)
+                    bodies[int(result["custom_id"])] = result["response"]["body"]
+            if len(bodies) < len(formatted_requests):
+                error = await self._batch_error(batch)
+                raise RuntimeError(f"batch {batch.id} {batch.status}: {len(formatted_requests) - len(bodies)} of {len(formatted_requests)} requests failed" + (f" ({error})" if error else ""))
+            # build responses leniently, like the SDK, so an unknown output type or enum value cannot fail a finished job
+            return [Response.construct(**bodies[i]) for i in range(len(formatted_requests))]
+        finally:
+            # don't leave prompts and responses stored with the provider
+            file_ids = [input_file.id, *((batch.output_file_id, batch.error_file_id) if batch else ())]
+            for file_id in filter(None, file_ids):
+                with contextlib.suppress(Exception):
+                    await self._async_client.files.delete(file_id)
+
+    async def _batch_error(self, batch: Any) -> str | None:
+        """Get the first error message of a batch, from its validation errors or its error file."""
+        if batch.errors and batch.errors.data:
+            return batch.errors.data[0].message
+        if batch.error_file_id:
+            errors = await self._retry(self._async_client.files.content, batch.error_file_id)
+            for line in errors.text.splitlines():
+                result = json.loads(line)
+                error = result.get("error") or ((result.get("response") or {}).get("body") or {}).get("error")
+                if error:
+                    return error.get("message")
+        return None
 
     @staticmethod
     def _extract_output(response: Any) -> T:
@@ -53,24 +138,28 @@ class TextClient(OpenAIClient[str]): ...
 
 
 class WebClient(OpenAIClient[str]):
+    TOOL: ClassVar[dict] = {"type": "web_search"}
+
     @classmethod
     def _inject_args(cls, model_args: dict) -> dict:
         """Add the web-search tool, merging with any existing tools."""
         model_args = super()._inject_args(model_args)
         tools = model_args.get("tools", [])
-        if not any(tool.get("type") == "web_search" for tool in tools):
-            tools = [*tools, {"type": "web_search"}]
+        if not any(tool.get("type") == cls.TOOL["type"] for tool in tools):
+            tools = [*tools, cls.TOOL]
         return {**model_args, "tools": tools}
 
 
 class ImageClient(OpenAIClient[bytes]):
+    TOOL: ClassVar[dict] = {"type": "image_generation"}
+
     @classmethod
     def _inject_args(cls, model_args: dict) -> dict:
         """Add the image-generation tool, merging with any existing tools."""
         model_args = super()._inject_args(model_args)
         tools = model_args.get("tools", [])
-        if not any(tool.get("type") == "image_generation" for tool in tools):
-            tools = [*tools, {"type": "image_generation"}]
+        if not any(tool.get("type") == cls.TOOL["type"] for tool in tools):
+            tools = [*tools, cls.TOOL]
         return {**model_args, "tools": tools}
 
     @staticmethod
@@ -10,11 +10,12 @@ class XAIClient[T](OpenAIClient[T]):
     """Base client for xAI via the OpenAI Responses API."""
 
     SPOOF_ASSISTANT_IMAGES = False
+    SUPPORTS_BATCH = False
 
     @staticmethod
     def _create_async_client(api_key: str) -> Any:
         import openai
-        return openai.AsyncOpenAI(api_key=api_key, base_url="https://api.x.ai/v1")
+        return openai.AsyncOpenAI(api_key=api_key, base_url="https://api.x.ai/v1", max_retries=0)
 
 
 class TextClient(XAIClient[str]): ...